@@ -0,0 +1,208 @@
+/*
+ * Optional C versions of the character scanners used by json_parser.
+ *
+ * Each function takes the JSON text and a start index and returns an index
+ * into the same string, so the parser never has to copy the input.
+ * json_parser falls back to pure Python versions when this module is missing.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+/* Character classes of the ASCII range, filled in once at module init */
+#define CLASS_WS 0x01
+#define CLASS_NUMBER 0x02
+
+static unsigned char char_class[128];
+
+#define HAS_CLASS(c, cls) ((c) < 128 && (char_class[(c)] & (cls)))
+
+static void
+init_char_class(void)
+{
+    const char *p;
+    for (p = " \t\r\n"; *p; p++) {
+        char_class[(unsigned char)*p] |= CLASS_WS;
+    }
+    for (p = "0123456789.-+eE"; *p; p++) {
+        char_class[(unsigned char)*p] |= CLASS_NUMBER;
+    }
+}
+
+static int
+unpack_args(PyObject *const *args, Py_ssize_t nargs, const char *name,
+            PyObject **s, Py_ssize_t *start)
+{
+    if (nargs != 2) {
+        PyErr_Format(PyExc_TypeError, "%s() takes exactly 2 arguments (%zd given)",
+                     name, nargs);
+        return -1;
+    }
+    if (!PyUnicode_Check(args[0])) {
+        PyErr_Format(PyExc_TypeError, "%s() argument 1 must be str", name);
+        return -1;
+    }
+    *s = args[0];
+    *start = PyLong_AsSsize_t(args[1]);
+    if (*start == -1 && PyErr_Occurred()) {
+        return -1;
+    }
+    if (*start < 0) {
+        *start = 0;
+    }
+    return 0;
+}
+
+/* skip_ws(s, start) -> index of the first non-whitespace character at or after start */
+static PyObject *
+skip_ws(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    PyObject *s;
+    Py_ssize_t i;
+    if (unpack_args(args, nargs, "skip_ws", &s, &i) < 0) {
+        return NULL;
+    }
+    Py_ssize_t n = PyUnicode_GET_LENGTH(s);
+    int kind = PyUnicode_KIND(s);
+    const void *data = PyUnicode_DATA(s);
+    if (kind == PyUnicode_1BYTE_KIND) {
+        const Py_UCS1 *buf = (const Py_UCS1 *)data;
+        while (i < n && HAS_CLASS(buf[i], CLASS_WS)) {
+            i++;
+        }
+        return PyLong_FromSsize_t(i);
+    }
+    while (i < n) {
+        Py_UCS4 c = PyUnicode_READ(kind, data, i);
+        if (!HAS_CLASS(c, CLASS_WS)) {
+            break;
+        }
+        i++;
+    }
+    return PyLong_FromSsize_t(i);
+}
+
+/* skip_separator(s, start) -> index after the whitespace and optional comma at start */
+static PyObject *
+skip_separator(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    PyObject *s;
+    Py_ssize_t i;
+    if (unpack_args(args, nargs, "skip_separator", &s, &i) < 0) {
+        return NULL;
+    }
+    Py_ssize_t n = PyUnicode_GET_LENGTH(s);
+    int kind = PyUnicode_KIND(s);
+    const void *data = PyUnicode_DATA(s);
+    int seen_comma = 0;
+    while (i < n) {
+        Py_UCS4 c = PyUnicode_READ(kind, data, i);
+        if (c == ',' && !seen_comma) {
+            seen_comma = 1;
+        }
+        else if (!HAS_CLASS(c, CLASS_WS)) {
+            break;
+        }
+        i++;
+    }
+    return PyLong_FromSsize_t(i);
+}
+
+/* scan_number(s, start) -> index after the run of number characters starting at start */
+static PyObject *
+scan_number(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    PyObject *s;
+    Py_ssize_t i;
+    if (unpack_args(args, nargs, "scan_number", &s, &i) < 0) {
+        return NULL;
+    }
+    Py_ssize_t n = PyUnicode_GET_LENGTH(s);
+    int kind = PyUnicode_KIND(s);
+    const void *data = PyUnicode_DATA(s);
+    if (kind == PyUnicode_1BYTE_KIND) {
+        const Py_UCS1 *buf = (const Py_UCS1 *)data;
+        while (i < n && HAS_CLASS(buf[i], CLASS_NUMBER)) {
+            i++;
+        }
+        return PyLong_FromSsize_t(i);
+    }
+    while (i < n) {
+        Py_UCS4 c = PyUnicode_READ(kind, data, i);
+        if (!HAS_CLASS(c, CLASS_NUMBER)) {
+            break;
+        }
+        i++;
+    }
+    return PyLong_FromSsize_t(i);
+}
+
+/* scan_string(s, start) -> index of the quote closing the string opened at start, or -1 */
+static PyObject *
+scan_string(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    PyObject *s;
+    Py_ssize_t i;
+    if (unpack_args(args, nargs, "scan_string", &s, &i) < 0) {
+        return NULL;
+    }
+    Py_ssize_t n = PyUnicode_GET_LENGTH(s);
+    int kind = PyUnicode_KIND(s);
+    const void *data = PyUnicode_DATA(s);
+    if (kind == PyUnicode_1BYTE_KIND) {
+        /* One byte per character: find the quote and any backslash with memchr */
+        const Py_UCS1 *buf = (const Py_UCS1 *)data;
+        const Py_UCS1 *quote = NULL;
+        for (i++; i < n; i += 2) {
+            if (quote == NULL || quote < buf + i) {
+                /* the previous quote, if any, was escaped */
+                quote = memchr(buf + i, '"', n - i);
+                if (quote == NULL) {
+                    break;
+                }
+            }
+            const Py_UCS1 *backslash = memchr(buf + i, '\\', quote - (buf + i));
+            if (backslash == NULL) {
+                return PyLong_FromSsize_t(quote - buf);
+            }
+            i = backslash - buf;  /* the loop step skips the escaped character */
+        }
+        return PyLong_FromSsize_t(-1);
+    }
+    for (i++; i < n; i++) {
+        Py_UCS4 c = PyUnicode_READ(kind, data, i);
+        if (c == '"') {
+            return PyLong_FromSsize_t(i);
+        }
+        if (c == '\\') {
+            i++;  /* skip the escaped character */
+        }
+    }
+    return PyLong_FromSsize_t(-1);
+}
+
+static PyMethodDef partialjson_methods[] = {
+    {"skip_ws", (PyCFunction)(void (*)(void))skip_ws, METH_FASTCALL,
+     "skip_ws(s, start) -> index of the first non-whitespace character at or after start"},
+    {"skip_separator", (PyCFunction)(void (*)(void))skip_separator, METH_FASTCALL,
+     "skip_separator(s, start) -> index after the whitespace and optional comma at start"},
+    {"scan_number", (PyCFunction)(void (*)(void))scan_number, METH_FASTCALL,
+     "scan_number(s, start) -> index after the run of number characters starting at start"},
+    {"scan_string", (PyCFunction)(void (*)(void))scan_string, METH_FASTCALL,
+     "scan_string(s, start) -> index of the quote closing the string opened at start, or -1"},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef partialjson_module = {
+    PyModuleDef_HEAD_INIT,
+    "_partialjson",
+    "C versions of the character scanners used by partialjson.json_parser.",
+    -1,
+    partialjson_methods
+};
+
+PyMODINIT_FUNC
+PyInit__partialjson(void)
+{
+    init_char_class();
+    return PyModule_Create(&partialjson_module);
+}
@@ -1,70 +1,193 @@
 from calendar import c
 import json
+import platform
+import re
+from functools import cached_property
+from itertools import islice
+from json.decoder import scanstring
+from json.scanner import make_scanner
+
+# PyPy's tracing JIT inlines direct calls but not calls through a table of bound methods
+_IS_PYPY = platform.python_implementation() == "PyPy"
+
+# The C scanner behind json.loads, able to decode a single value at an offset
+_scan_once = make_scanner(json.JSONDecoder())
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SEPARATOR = re.compile(r"[ \t\n\r]*,?[ \t\n\r]*")
+_NUMBER_CHARS = re.compile(r"[0-9.\-+eE]*")
+_STRING_SPECIALS = re.compile(r'["\\]')
+_CONTROL_CHARS = re.compile(r"[\x00-\x1f]")
+
+
+def _skip_ws_py(s, i):
+    """Return the index of the first non-whitespace character of s at or after i."""
+    n = len(s)
+    if i < n and s[i] in " \r\n\t":
+        if i + 4 < n and s[i + 4] in " \r\n\t":
+            # Probably a long run such as indentation; let the regex engine skip it
+            return _WHITESPACE.match(s, i).end()
+        i += 1
+        while i < n and s[i] in " \r\n\t":
+            i += 1
+    return i
+
+
+def _skip_separator_py(s, i):
+    """Return the index after the whitespace and optional comma following a value at s[i]."""
+    return _SEPARATOR.match(s, i).end()
+
+
+def _truncated_copy(container, length):
+    """Return a shallow copy of a list or dict holding only its first length items."""
+    if type(container) is list:
+        return container[:length]
+    return dict(islice(container.items(), length))
+
+
+def _scan_number_py(s, i):
+    """Return the index after the run of number characters of s starting at i."""
+    return _NUMBER_CHARS.match(s, i).end()
+
+
+def _scan_string_py(s, i):
+    """Return the index of the quote closing the string opened at s[i], or -1 if it is not closed."""
+    while True:
+        m = _STRING_SPECIALS.search(s, i + 1)
+        if m is None:
+            return -1
+        i = m.start()
+        if s[i] == '"':
+            return i
+        i += 1  # skip the character the backslash escapes
+
+
+# Use the compiled scanners when the optional C extension was built
+try:
+    from ._partialjson import scan_number as _scan_number
+    from ._partialjson import scan_string as _scan_string
+    from ._partialjson import skip_separator as _skip_separator
+    from ._partialjson import skip_ws as _skip_ws
+except ImportError:
+    _scan_number = _scan_number_py
+    _scan_string = _scan_string_py
+    _skip_separator = _skip_separator_py
+    _skip_ws = _skip_ws_py
 
 
 class JSONParser:
-    def __init__(self):
-        self.parsers = {
-            " ": self.parse_space,
-            "\r": self.parse_space,
-            "\n": self.parse_space,
-            "\t": self.parse_space,
-            "[": self.parse_array,
-            "{": self.parse_object,
-            '"': self.parse_string,
-            "t": self.parse_true,
-            "f": self.parse_false,
-            "n": self.parse_null,
-        }
-        # Adding parsers for numbers
-        for c in "0123456789.-":
-            self.parsers[c] = self.parse_number
+    # Name of the parser method for each character that can start a JSON value
+    _PARSER_NAMES = {
+        " ": "parse_space",
+        "\r": "parse_space",
+        "\n": "parse_space",
+        "\t": "parse_space",
+        "[": "parse_array",
+        "{": "parse_object",
+        '"': "parse_string",
+        "t": "parse_true",
+        "f": "parse_false",
+        "n": "parse_null",
+    }
+    # Adding parsers for numbers
+    _PARSER_NAMES.update(dict.fromkeys("0123456789.-", "parse_number"))
 
+    def __init__(self):
         self.last_parse_reminding = None
         self.on_extra_token = self.default_on_extra_token
 
+        # Resumable state of the last streaming partial parse, for inputs that keep growing
+        self._last_input = ""
+        self._last_partial_state = None
+
+    @cached_property
+    def _dispatch(self) -> list:
+        """ASCII lookup table of parser methods, indexed by ord() of the first character of a token.
+
+        Built on first use, so creating a parser that only ever sees valid JSON binds no methods.
+        """
+        dispatch = [None] * 128
+        methods = {}
+        for c, name in self._PARSER_NAMES.items():
+            if name not in methods:
+                methods[name] = getattr(self, name)
+            dispatch[ord(c)] = methods[name]
+        return dispatch
+
     def default_on_extra_token(self, text, data, reminding):
         print(
             "Parsed JSON with extra tokens:",
             {"text": text, "data": data, "reminding": reminding},
         )
 
-    def parse(self, s) -> tuple[dict | list, list[str]]:
+    def parse(self, s, stream=False) -> tuple[dict | list, list[str]]:
         """Parse a JSON string and return the parsed data and the keys that are complete in the data.
+
+        With stream=True, a partial parse of text that extends the input of the previous
+        streaming call resumes where that call stopped instead of starting over. The data
+        returned then shares objects with the state kept for the next call, so it must not
+        be mutated, and the parser must not be shared between streams or threads.
         Args:
             s (str): The JSON string to parse.
+            stream (bool): Whether to resume from the previous streaming call.
         Returns:
             tuple[dict | list, list[str]]: The parsed data and the keys that are complete in the data.
         """
+        result, is_partial = self._parse(s, stream)
+        if isinstance(result, dict):
+            if is_partial:
+                # The last key of a partial object may still be incomplete
+                complete_keys = list(islice(result, max(len(result) - 1, 0)))
+            else:
+                complete_keys = list(result)
+        else:
+            complete_keys = []
+
+        return result, complete_keys
+
+    def parse_fast(self, s, stream=False) -> dict | list:
+        """Parse a JSON string and return only the parsed data, without computing the complete keys.
+        Args:
+            s (str): The JSON string to parse.
+            stream (bool): Whether to resume from the previous streaming call, as in parse.
+        Returns:
+            dict | list: The parsed data.
+        """
+        return self._parse(s, stream)[0]
+
+    def _parse(self, s, stream=False) -> tuple[dict | list, bool]:
+        """Parse a JSON string, falling back to the partial parser if it is not valid JSON.
+        Args:
+            s (str): The JSON string to parse.
+            stream (bool): Whether to resume from the previous streaming call.
+        Returns:
+            tuple[dict | list, bool]: The parsed data and a flag indicating if the data is partial.
+        """
         if len(s) >= 1:
             try:
-                result = json.loads(s)
-                if isinstance(result, dict):
-                    complete_keys = list(result.keys())
-                else:
-                    complete_keys = []
+                return json.loads(s), False
+            except (json.JSONDecodeError, RecursionError) as e:
+                if stream:
+                    if not s.startswith(self._last_input):
+                        self._last_partial_state = None
+                    self._last_input = s
 
-                return result, complete_keys
-            except json.JSONDecodeError as e:
-                data, reminding, _ = self.parse_any(s, e)
+                i = _skip_ws(s, 0)
+                if (stream and self._last_partial_state) or (i < len(s) and s[i] in "[{"):
+                    data, i, is_complete = self._parse_container(s, i, e, stream)
+                else:
+                    data, i, is_complete = self._parse_any(s, i, e)
+                reminding = s[i:]
 
                 self.last_parse_reminding = reminding
                 if self.on_extra_token and reminding:
                     self.on_extra_token(s, data, reminding)
 
-                result = json.loads(json.dumps(data))
-                if isinstance(result, dict):
-                    complete_keys = list(result.keys())
-                    if len(complete_keys) == 0:
-                        complete_keys = []
-                    else:
-                        complete_keys = complete_keys[:-1]
-                else:
-                    complete_keys = []
-
-                return result, complete_keys
+                # Valid JSON too deeply nested for json.loads is complete all the same
+                too_deep = isinstance(e, RecursionError)
+                return data, not (too_deep and is_complete and _skip_ws(s, i) >= len(s))
         else:
-            return json.loads("{}"), []
+            return {}, False
 
     def parse_any(self, s, e) -> tuple[dict | list, str, bool]:
         """Parse any JSON value from the given string.
@@ -74,145 +197,311 @@ class JSONParser:
         Returns:
             tuple[dict | list, str, bool]: The parsed value, the remaining string, and a flag indicating if the value is complete.
         """
-        if not s:
+        value, i, is_complete = self._parse_any(s, 0, e)
+        return value, s[i:], is_complete
+
+    def _parse_any(self, s, i, e) -> tuple[dict | list, int, bool]:
+        """Parse any JSON value from the given string, starting at index i.
+        Args:
+            s (str): The string to parse.
+            i (int): The index to start parsing at.
+            e (json.JSONDecodeError): The exception to raise if the string is invalid.
+        Returns:
+            tuple[dict | list, int, bool]: The parsed value, the index after it, and a flag indicating if the value is complete.
+        """
+        if i >= len(s):
             raise e
-        parser = self.parsers.get(s[0])
+        o = ord(s[i])
+        parser = self._dispatch[o] if o < 128 else None
         if not parser:
             raise e
-        return parser(s, e)
+        return parser(s, i, e)
+
+    def _parse_any_fast(self, s, i, e) -> tuple[dict | list, int, bool]:
+        """Parse any JSON value from the given string, dispatching with an explicit if/elif ladder.
 
-    def parse_space(self, s, e) -> tuple[dict | list, str, bool]:
+        Used instead of _parse_any on PyPy, whose tracing JIT can inline these direct
+        calls but not calls through the table of bound methods.
+        Args:
+            s (str): The string to parse.
+            i (int): The index to start parsing at.
+            e (json.JSONDecodeError): The exception to raise if the string is invalid.
+        Returns:
+            tuple[dict | list, int, bool]: The parsed value, the index after it, and a flag indicating if the value is complete.
+        """
+        if i >= len(s):
+            raise e
+        c = s[i]
+        if c == '"':
+            return self.parse_string(s, i, e)
+        elif c in "0123456789.-":
+            return self.parse_number(s, i, e)
+        elif c == "[":
+            return self.parse_array(s, i, e)
+        elif c == "{":
+            return self.parse_object(s, i, e)
+        elif c == "t":
+            return self.parse_true(s, i, e)
+        elif c == "f":
+            return self.parse_false(s, i, e)
+        elif c == "n":
+            return self.parse_null(s, i, e)
+        elif c in " \r\n\t":
+            return self.parse_space(s, i, e)
+        raise e
+
+    if _IS_PYPY:
+        _parse_any = _parse_any_fast
+
+    def parse_space(self, s, i, e) -> tuple[dict | list, int, bool]:
         """Parse a space from the given string.
         Args:
             s (str): The string to parse.
+            i (int): The index to start parsing at.
             e (json.JSONDecodeError): The exception to raise if the string is invalid.
         Returns:
-            tuple[dict | list, str, bool]: The parsed space, the remaining string, and a flag indicating if the space is complete.
+            tuple[dict | list, int, bool]: The parsed space, the index after it, and a flag indicating if the space is complete.
         """
-        return self.parse_any(s.strip(), e)
+        return self._parse_any(s, _skip_ws(s, i), e)
 
-    def parse_array(self, s, e) -> tuple[list, str, bool]:
+    def parse_array(self, s, i, e) -> tuple[list, int, bool]:
         """Parse an array from the given string.
         Args:
             s (str): The string to parse.
+            i (int): The index of the opening '['.
             e (json.JSONDecodeError): The exception to raise if the string is invalid.
         Returns:
-            tuple[list, str, bool]: The parsed array, the remaining string, and a flag indicating if the array is complete.
+            tuple[list, int, bool]: The parsed array, the index after it, and a flag indicating if the array is complete.
         """
-        s = s[1:]  # skip starting '['
-        acc = []
-        s = s.strip()
-
-        has_any_incomplete = False
-        while s:
-            if s[0] == "]":
-                s = s[1:]  # skip ending ']'
-                break
-            res, s, is_complete = self.parse_any(s, e)
-            if not is_complete:
-                has_any_incomplete = True
-
-            acc.append(res)
-            s = s.strip()
-            if s.startswith(","):
-                s = s[1:]
-                s = s.strip()
-        return acc, s, not has_any_incomplete
-
-    def parse_object(self, s, e) -> tuple[dict, str, bool]:
+        return self._parse_container(s, i, e)
+
+    def parse_object(self, s, i, e) -> tuple[dict, int, bool]:
         """Parse an object from the given string.
         Args:
             s (str): The string to parse.
+            i (int): The index of the opening '{'.
             e (json.JSONDecodeError): The exception to raise if the string is invalid.
         Returns:
-            tuple[dict, str, bool]: The parsed object, the remaining string, and a flag indicating if the object is complete.
+            tuple[dict, int, bool]: The parsed object, the index after it, and a flag indicating if the object is complete.
         """
-        s = s[1:]  # skip starting '{'
-        acc = {}
-        s = s.strip()
-
-        has_any_incomplete = False
-        while s:
-            if s[0] == "}":
-                s = s[1:]  # skip ending '}'
-                break
-            key, s, is_complete = self.parse_any(s, e)
-            if not is_complete:
-                has_any_incomplete = True
-
-            s = s.strip()
-
-            # Handle case where object ends after a key
-            if not s or s[0] == "}":
-                acc[key] = None
-                has_any_incomplete = True
-                break
-
-            # Expecting a colon after the key
-            if s[0] != ":":
-                has_any_incomplete = True
-                raise e  # or handle this scenario as per your requirement
-
-            s = s[1:]  # skip ':'
-            s = s.strip()
-
-            # Handle case where value is missing or incomplete
-            if not s or s[0] in ",}":
-                acc[key] = None
-                if s.startswith(","):
-                    s = s[1:]
-
-                has_any_incomplete = True
-                break
-
-            value, s, is_complete = self.parse_any(s, e)
-            if not is_complete:
-                has_any_incomplete = True
-
-            acc[key] = value
-            s = s.strip()
-            if s.startswith(","):
-                s = s[1:]
-                s = s.strip()
-
-        return acc, s, not has_any_incomplete
-
-    def parse_string(self, s, e) -> tuple[str, str, bool]:
+        return self._parse_container(s, i, e)
+
+    def _parse_container(self, s, i, e, stream=False) -> tuple[dict | list, int, bool]:
+        """Parse an array or object, including everything nested in it, without recursion.
+
+        Open containers are kept on an explicit stack of (container, pending key,
+        is_complete, length) frames, linked as (frame, parent) pairs so the stack at a
+        token boundary can be kept without copying it. Nested containers are first handed to the C scanner
+        used by json.loads, so every complete container is decoded in one call and only
+        the containers still open at the end of the input are walked here.
+
+        When streaming, the parse resumes from the state saved by the previous call,
+        whose input must be a prefix of s, and saves the state at the last token
+        boundary for the next call, so text that grows on every call is not reparsed.
+        Args:
+            s (str): The string to parse.
+            i (int): The index of the opening '[' or '{'. Ignored when resuming.
+            e (json.JSONDecodeError): The exception to raise if the string is invalid.
+            stream (bool): Whether to resume from and save to the streaming state.
+        Returns:
+            tuple[dict | list, int, bool]: The parsed container, the index after it, and a flag indicating if the container is complete.
+        """
+        n = len(s)
+        skip_ws = _skip_ws
+        scan_once = _scan_once
+        skip_separator = _skip_separator
+        dispatch = None if _IS_PYPY else self._dispatch
+        parse_any_fast = self._parse_any_fast
+        parse_string = self.parse_string
+
+        state = self._last_partial_state if stream else None
+        if state:
+            # Continue on copies, the previous result was handed to the caller
+            i, stack, acc, length, is_complete = state
+            frames = []
+            while stack:
+                frame, stack = stack
+                frames.append(frame)
+            for c, key, complete, k in reversed(frames):
+                stack = ((_truncated_copy(c, k), key, complete, k), stack)
+            acc = _truncated_copy(acc, length)
+            self._last_partial_state = None
+        else:
+            stack = None
+            acc = [] if s[i] == "[" else {}
+            is_complete = True
+            i = skip_ws(s, i + 1)  # skip starting '[' or '{'
+        key = None
+        safe_i = -1
+
+        while True:
+            if stream and i < n:
+                # Token boundary: resuming here gives the same result for any longer input
+                safe_i, safe_stack, safe_acc, safe_len, safe_complete = (
+                    i, stack, acc, len(acc), is_complete
+                )
+
+            if type(acc) is list:
+                if i >= n:
+                    is_complete = False  # not closed before the end of the input
+                    closed = True
+                elif s[i] == "]":
+                    i += 1  # skip ending ']'
+                    closed = True
+                else:
+                    closed = False
+            elif i >= n:
+                is_complete = False  # not closed before the end of the input
+                closed = True
+            elif s[i] == "}":
+                i += 1  # skip ending '}'
+                closed = True
+            else:
+                closed = False
+                if s[i] in "[{":
+                    raise e
+                if dispatch is None:
+                    key, i, key_complete = parse_any_fast(s, i, e)
+                else:
+                    o = ord(s[i])
+                    parser = dispatch[o] if o < 128 else None
+                    if not parser:
+                        raise e
+                    key, i, key_complete = parser(s, i, e)
+                if not key_complete:
+                    is_complete = False
+                if key is None or isinstance(key, (int, float)):
+                    key = json.dumps(key)  # JSON object keys are always strings
+
+                i = skip_ws(s, i)
+
+                # Handle case where object ends after a key
+                if i >= n or s[i] == "}":
+                    if stream and key in acc:
+                        safe_i = -1  # the boundary saved the previous value of this key
+                    acc[key] = None
+                    is_complete = False
+                    closed = True
+
+                # Expecting a colon after the key
+                elif s[i] != ":":
+                    raise e
+
+                else:
+                    i = skip_ws(s, i + 1)  # skip ':'
+
+                    # Handle case where value is missing or incomplete
+                    if i >= n or s[i] in ",}":
+                        if stream and key in acc:
+                            safe_i = -1  # the boundary saved the previous value of this key
+                        acc[key] = None
+                        if i < n and s[i] == ",":
+                            i += 1
+                        is_complete = False
+                        closed = True
+
+            if closed:
+                if not stack:
+                    if stream and i >= n and safe_i >= 0:
+                        self._last_partial_state = (
+                            safe_i, safe_stack, safe_acc, safe_len, safe_complete
+                        )
+                    return acc, i, is_complete
+                value, value_complete = acc, is_complete
+                (acc, key, is_complete, _), stack = stack
+                if not value_complete:
+                    is_complete = False
+            else:
+                c = s[i]
+                if c in "[{":
+                    end = -1
+                    if scan_once:
+                        try:
+                            value, end = scan_once(s, i)
+                        except RecursionError:
+                            # Too deep for the C scanner; walk the rest of the input here
+                            scan_once = None
+                        except (json.JSONDecodeError, StopIteration):
+                            pass
+                    if end < 0:
+                        # Still open at the end of the input: descend into it
+                        stack = ((acc, key, is_complete, len(acc)), stack)
+                        acc = [] if c == "[" else {}
+                        key = None
+                        is_complete = True
+                        i = skip_ws(s, i + 1)  # skip starting '[' or '{'
+                        continue
+                    i = end
+                elif c == "t" and s.startswith("true", i):
+                    value = True
+                    i += 4
+                elif c == "f" and s.startswith("false", i):
+                    value = False
+                    i += 5
+                elif c == "n" and s.startswith("null", i):
+                    value = None
+                    i += 4
+                elif c == '"':
+                    value, i, value_complete = parse_string(s, i, e)
+                    if not value_complete:
+                        is_complete = False
+                else:
+                    if dispatch is None:
+                        value, i, value_complete = parse_any_fast(s, i, e)
+                    else:
+                        o = ord(c)
+                        parser = dispatch[o] if o < 128 else None
+                        if not parser:
+                            raise e
+                        value, i, value_complete = parser(s, i, e)
+                    if not value_complete:
+                        is_complete = False
+
+            if type(acc) is list:
+                acc.append(value)
+            else:
+                if stream and key in acc:
+                    # A duplicate key overwrites a value saved at the boundary by reference,
+                    # which truncating by length cannot undo; wait for the next boundary
+                    safe_i = -1
+                acc[key] = value
+            i = skip_separator(s, i)
+
+    def parse_string(self, s, i, e) -> tuple[str, int, bool]:
         """Parse a string from the given string.
         Args:
             s (str): The string to parse.
+            i (int): The index of the opening quote.
             e (json.JSONDecodeError): The exception to raise if the string is invalid.
         Returns:
-            tuple[str, str, bool]: The parsed string, the remaining string, and a flag indicating if the string is complete.
+            tuple[str, int, bool]: The parsed string, the index after it, and a flag indicating if the string is complete.
         """
-        end = s.find('"', 1)
-        while end != -1 and s[end - 1] == "\\":  # Handle escaped quotes
-            end = s.find('"', end + 1)
+        end = _scan_string(s, i)
         if end == -1:
             return (
-                s[1:],
-                "",
+                s[i + 1 :],
+                len(s),
                 False,
             )  # Return the incomplete string without the opening quote
-        str_val = s[: end + 1]
-        s = s[end + 1 :]
-        return json.loads(str_val), s, True
+        value = s[i + 1 : end]
+        if "\\" in value or _CONTROL_CHARS.search(value):
+            # Decode escapes, and reject raw control characters like json.loads does
+            value = scanstring(s, i + 1)[0]
+        return value, end + 1, True
 
-    def parse_number(self, s, e) -> tuple[float | int, str, bool]:
+    def parse_number(self, s, i, e) -> tuple[float | int, int, bool]:
         """Parse a number from the given string.
         Args:
             s (str): The string to parse.
+            i (int): The index of the first character of the number.
             e (json.JSONDecodeError): The exception to raise if the string is invalid.
         Returns:
-            tuple[float | int, str]: The parsed number and the remaining string.
+            tuple[float | int, int, bool]: The parsed number, the index after it, and a flag indicating if the number is complete.
         """
-        i = 0
-        while i < len(s) and s[i] in "0123456789.-":
-            i += 1
-        num_str = s[:i]
-        s = s[i:]
-        if not num_str or num_str.endswith(".") or num_str.endswith("-"):
-            return num_str, "", False  # Return the incomplete number as is
+        end = _scan_number(s, i)
+        num_str = s[i:end]
+        if not num_str or num_str[-1] in ".-+eE":
+            return num_str, len(s), False  # Return the incomplete number as is
         try:
             num = (
                 float(num_str)
@@ -221,40 +510,43 @@ class JSONParser:
             )
         except ValueError:
             raise e
-        return num, s, True
+        return num, end, True
 
-    def parse_true(self, s, e) -> tuple[bool, str, bool]:
+    def parse_true(self, s, i, e) -> tuple[bool, int, bool]:
         """Parse a true value from the given string.
         Args:
             s (str): The string to parse.
+            i (int): The index to start parsing at.
             e (json.JSONDecodeError): The exception to raise if the string is invalid.
         Returns:
-            tuple[bool, str, bool]: The parsed true value, the remaining string, and a flag indicating if the true value is complete.
+            tuple[bool, int, bool]: The parsed true value, the index after it, and a flag indicating if the true value is complete.
         """
-        if s.startswith("true"):
-            return True, s[4:], True
+        if s.startswith("true", i):
+            return True, i + 4, True
         raise e
 
-    def parse_false(self, s, e) -> tuple[bool, str, bool]:
+    def parse_false(self, s, i, e) -> tuple[bool, int, bool]:
         """Parse a false value from the given string.
         Args:
             s (str): The string to parse.
+            i (int): The index to start parsing at.
             e (json.JSONDecodeError): The exception to raise if the string is invalid.
         Returns:
-            tuple[bool, str, bool]: The parsed false value, the remaining string, and a flag indicating if the false value is complete.
+            tuple[bool, int, bool]: The parsed false value, the index after it, and a flag indicating if the false value is complete.
         """
-        if s.startswith("false"):
-            return False, s[5:], True
+        if s.startswith("false", i):
+            return False, i + 5, True
         raise e
 
-    def parse_null(self, s, e) -> tuple[None, str, bool]:
+    def parse_null(self, s, i, e) -> tuple[None, int, bool]:
         """Parse a null value from the given string.
         Args:
             s (str): The string to parse.
+            i (int): The index to start parsing at.
             e (json.JSONDecodeError): The exception to raise if the string is invalid.
         Returns:
-            tuple[None, str, bool]: The parsed null value, the remaining string, and a flag indicating if the null value is complete.
+            tuple[None, int, bool]: The parsed null value, the index after it, and a flag indicating if the null value is complete.
         """
-        if s.startswith("null"):
-            return None, s[4:], True
+        if s.startswith("null", i):
+            return None, i + 4, True
         raise e
@@ -2,7 +2,7 @@ import os.path
 import pathlib
 import re
 
-from setuptools import setup
+from setuptools import Extension, setup
 
 PROJECT_NAME = 'partialjson'
 # The directory containing this file
@@ -18,6 +18,20 @@ def get_property(prop):
     return result.group(1)
 
 
+# The optional C scanners are only built on request, e.g.
+# `PARTIALJSON_BUILD_EXT=1 pip install .`, so the published wheel stays pure
+# Python. The pure Python fallback is used if the build is skipped or fails.
+EXT_MODULES = []
+if os.environ.get('PARTIALJSON_BUILD_EXT'):
+    EXT_MODULES.append(
+        Extension(
+            'partialjson._partialjson',
+            sources=['partialjson/_partialjson.c'],
+            optional=True,
+        )
+    )
+
+
 setup(
     name='partialjson',
     version=get_property('__version__'),
@@ -29,4 +43,5 @@ setup(
     author_email=get_property('__author_email__'),
     license=get_property('__license__'),
     packages=['partialjson'],
+    ext_modules=EXT_MODULES,
 )
\ No newline at end of file
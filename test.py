@@ -1,6 +1,15 @@
 import unittest
+import random
+import time
+from unittest import mock
+from partialjson import json_parser
 from partialjson.json_parser import JSONParser
 
+try:
+    from partialjson import _partialjson
+except ImportError:
+    _partialjson = None
+
 class TestJSONParser(unittest.TestCase):
     def setUp(self):
         self.parser = JSONParser()
@@ -37,6 +46,19 @@ class TestJSONParser(unittest.TestCase):
         self.assertEqual(self.parser.parse('"I\'m text"'), "I'm text")
         self.assertEqual(self.parser.parse('"I\\"m text"'), 'I"m text')
 
+    def test_string_with_escaped_backslash(self):
+        self.assertEqual(self.parser.parse('["a\\\\", "b"')[0], ["a\\", "b"])
+
+    def test_string_with_escaped_backslash_and_quote(self):
+        self.assertEqual(self.parser.parse('["a\\\\\\"b", "c"')[0], ['a\\"b', "c"])
+        self.assertEqual(self.parser.parse('["' + "\\" * 1000 + '", 1')[0], ["\\" * 500, 1])
+
+    def test_string_with_control_character(self):
+        with self.assertRaises(Exception):
+            self.parser.parse('["a\nb", 1')
+        with self.assertRaises(Exception):
+            self.parser.parse('["a\nb\\n", 1')
+
     def test_incomplete_string(self):
         with self.assertRaises(Exception):
             self.parser.parse('"I am text')
@@ -63,6 +85,24 @@ class TestJSONParser(unittest.TestCase):
         self.assertEqual(self.parser.parse("[1"), [1])
         self.assertEqual(self.parser.parse("["), [])
 
+    def test_deeply_nested_array(self):
+        data, _ = self.parser.parse("[" * 10000)
+        for _ in range(9999):
+            self.assertEqual(len(data), 1)
+            data = data[0]
+        self.assertEqual(data, [])
+
+    def test_very_deeply_nested_array_is_linear(self):
+        start = time.perf_counter()
+        data, _ = self.parser.parse("[" * 100000)
+        # Quadratic in the depth this takes minutes; linear it is well under a second
+        self.assertLess(time.perf_counter() - start, 5)
+        self.assertEqual(type(data), list)
+
+    def test_deeply_nested_complete_object(self):
+        text = '{"a": 1, "b": ' + "[" * 5000 + "]" * 5000 + "}"
+        self.assertEqual(self.parser.parse(text)[1], ["a", "b"])
+
     # Object Tests
     def test_simple_object(self):
         o = {"a": "apple", "b": "banana"}
@@ -70,6 +110,57 @@ class TestJSONParser(unittest.TestCase):
         self.assertEqual(self.parser.parse('{"a": "apple","b": "banana"}'), o)
         self.assertEqual(self.parser.parse('{"a" : "apple", "b" : "banana"}'), o)
 
+    def test_complete_keys(self):
+        self.assertEqual(self.parser.parse('{"a": 1, "b": 2}')[1], ["a", "b"])
+        self.assertEqual(self.parser.parse('{"a": 1, "b": 2')[1], ["a"])
+        self.assertEqual(self.parser.parse('{')[1], [])
+
+    def test_parse_fast(self):
+        self.assertEqual(self.parser.parse_fast('{"a": [1, 2], "b": "ban'), {"a": [1, 2], "b": "ban"})
+
+    def test_if_elif_dispatch_matches_table(self):
+        text = '{"a": [1, -2.5e3, "x\\"y"], "b": {"c": true, "d": [false, null]}, "e": " f"}'
+
+        def outcomes():
+            for i in range(1, len(text) + 1):
+                try:
+                    yield JSONParser().parse(text[:i])
+                except Exception as e:
+                    yield type(e)  # partial literals are rejected either way
+
+        expected = list(outcomes())
+        with mock.patch.object(json_parser, "_IS_PYPY", True), \
+                mock.patch.object(JSONParser, "_parse_any", JSONParser._parse_any_fast):
+            self.assertEqual(list(outcomes()), expected)
+
+    def test_streaming_prefixes(self):
+        text = (
+            '{"id": 1, "ids": [1, "two", {"item": [3.5, -2e3]}], "item": "d\\"e", '
+            '"items": {"id": [4, {"ids": 5}], "id": [6]}, "id": 7, "ids": {"a": 8}}'
+        )
+        for i in range(1, len(text) + 1):
+            self.assertEqual(self.parser.parse(text[:i], stream=True), JSONParser().parse(text[:i]))
+
+    def test_streaming_after_partial_duplicate_key(self):
+        self.parser.parse('{"a": 1, "b": 2, "a', stream=True)
+        text = '{"a": 1, "b": 2, "ab": 3, "c'
+        self.assertEqual(self.parser.parse(text, stream=True), JSONParser().parse(text))
+        self.assertEqual(self.parser.parse(text, stream=True)[0]["a"], 1)
+
+    def test_streaming_does_not_mutate_previous_result(self):
+        first = self.parser.parse('[1, [2, 3', stream=True)
+        self.parser.parse('[1, [2, 3, 4], 5', stream=True)
+        self.assertEqual(first, ([1, [2, 3]], []))
+
+    def test_mutating_result_does_not_affect_next_parse(self):
+        data, _ = self.parser.parse('{"items": [1, 2, 3], "b": [4, 5')
+        data["items"].clear()
+        data["b"].append("mutated")
+        self.assertEqual(
+            self.parser.parse('{"items": [1, 2, 3], "b": [4, 5, 6'),
+            ({"items": [1, 2, 3], "b": [4, 5, 6]}, ["items"]),
+        )
+
     # Invalid Inputs
     def test_invalid_input(self):
         with self.assertRaises(Exception):
@@ -80,5 +171,22 @@ class TestJSONParser(unittest.TestCase):
         self.assertEqual(self.parser.parse(" [1] "), [1])
         self.assertEqual(self.parser.parse(" [1 "), [1])
 
+@unittest.skipUnless(_partialjson, "C extension not built")
+class TestCScanners(unittest.TestCase):
+    def test_scanners_match_python_fallbacks(self):
+        scanners = [
+            (_partialjson.skip_ws, json_parser._skip_ws_py),
+            (_partialjson.skip_separator, json_parser._skip_separator_py),
+            (_partialjson.scan_number, json_parser._scan_number_py),
+            (_partialjson.scan_string, json_parser._scan_string_py),
+        ]
+        rng = random.Random(0)
+        alphabet = ' \t\r\n,"\\09.-+eEax\u00e9\u20ac\U0001f600'
+        for _ in range(5000):
+            s = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+            for i in range(len(s) + 1):
+                for c_scan, py_scan in scanners:
+                    self.assertEqual(c_scan(s, i), py_scan(s, i), (c_scan.__name__, s, i))
+
 if __name__ == '__main__':
     unittest.main()